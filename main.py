@@ -1,16 +1,20 @@
 """Runs a trading simulation with the implemented features."""
 
+import sys
+
 from matching_engine.quote import Order
 from matching_engine.book import OrderBook
 
 
 def start_trading() -> None:
-    """Run the matching engine designed in `OrderBook` - receiving orders by inputs at the terminal - and stops running once the quote string is 'stop'."""
+    """Run the matching engine designed in `OrderBook` - receiving orders line by line from the standard input - and stops running once the quote string is 'stop' or the input ends."""
     book = OrderBook()
-    quote: str = input()
-    while quote != "stop":
-        book.add_order(Order(quote))
-        quote = input()
+    for quote in sys.stdin.buffer:
+        quote = quote.strip()
+        if quote == b"stop":
+            break
+        if quote:
+            book.add_order(Order(quote))
 
 
 if __name__ == "__main__":
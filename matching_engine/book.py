@@ -1,7 +1,10 @@
 """Implements an order book of a simplified exchange as a wrapper for two book
 sides."""
 
-from .quote import Order
+import sys
+from typing import Optional, Tuple
+
+from .quote import Order, TICKS_PER_UNIT
 from .level import Level
 from .side import BookSide
 
@@ -15,15 +18,33 @@ class OrderBook:
         Side of the order book containing bid price levels
     ask : Bookside
         Side of the order book containing ask price levels
+    orders_by_id : dict[int, Order]
+        Indexes every booked limit order by its `id`
+    reports : list[str]
+        Output lines waiting to be displayed
 
     Methods
     -------
     add_order(order: Order) -> None:
         Adds an order to the order book.
 
+    best_bid() -> Optional[Tuple[int, int]]:
+        Returns the price and quantity of the best bid level,
+        read from its cached level without walking the tree.
+
+    best_ask() -> Optional[Tuple[int, int]]:
+        Returns the price and quantity of the best ask level,
+        read from its cached level without walking the tree.
+
     process_limit_order(order: Order) -> None:
         Adds a limit order to the book.
 
+    process_buy_limit_order(order: Order) -> None:
+        Adds a buy limit order to the book.
+
+    process_sell_limit_order(order: Order) -> None:
+        Adds a sell limit order to the book.
+
     process_market_order(order: Order) -> None:
         Finds and executes available trades.
 
@@ -35,8 +56,11 @@ class OrderBook:
         Matches as many booked orders in the level as possible
         with the given market order.
 
-    print_match(price: float, qty: int) -> None:
-        Displays the results of a successful match.
+    print_match(price: int, qty: int) -> None:
+        Queues the results of a successful match to be displayed.
+
+    flush_reports() -> None:
+        Displays every queued output line at once.
 
     reallocate_order(order: Order, origin_level: Level) -> None:
         Reinserts a modified order in the order book.
@@ -46,6 +70,8 @@ def __init__(self) -> None:
         """Build a new Order Book."""
         self.bid = BookSide(True)
         self.ask = BookSide(False)
+        self.orders_by_id: dict[int, Order] = {}
+        self.reports: list[str] = []
 
     def add_order(self, order: Order) -> None:
         """Add an order to the order book.
@@ -57,6 +83,31 @@ def add_order(self, order: Order) -> None:
             self.process_limit_order(order)
         else:
             self.process_market_order(order)
+        self.flush_reports()
+
+    def best_bid(self) -> Optional[Tuple[int, int]]:
+        """Return the price and quantity of the best bid level.
+
+        Returns:
+            tuple[int, int]: price (in ticks) and total quantity
+            None: if there are no bids
+        """
+        level = self.bid.highest
+        if level is None:
+            return None
+        return level.price, level.total_qty
+
+    def best_ask(self) -> Optional[Tuple[int, int]]:
+        """Return the price and quantity of the best ask level.
+
+        Returns:
+            tuple[int, int]: price (in ticks) and total quantity
+            None: if there are no asks
+        """
+        level = self.ask.lowest
+        if level is None:
+            return None
+        return level.price, level.total_qty
 
     def process_limit_order(self, order: Order) -> None:
         """Insert a limit order to the book.
@@ -72,28 +123,56 @@ def process_limit_order(self, order: Order) -> None:
         a sell order at `x` meeting a buy at `y`, with `x <= y`, will
         trigger a trade. However, if there aren't any good offers,
         the order will be simply booked.
+
+        The side of the order is checked only once, here, so that each
+        matching loop below runs without branching on it.
         """
-        counterparty_side: BookSide = self.ask if order.is_buy else self.bid
-        order_side: BookSide = self.bid if order.is_buy else self.ask
-        if counterparty_side.total_qty == 0:
-            order_side.register_order(order)
-            return
         if order.is_buy:
-            counterparty_level = self.ask.min_level()
+            self.process_buy_limit_order(order)
         else:
-            counterparty_level = self.bid.max_level()
-        while order.qty > 0:
-            if counterparty_level is None:
-                order_side.register_order(order)
-                return
-            elif order.is_buy and (order.price < counterparty_level.price):
-                order_side.register_order(order)
-                return
-            elif not order.is_buy and (order.price > counterparty_level.price):
-                order_side.register_order(order)
-                return
+            self.process_sell_limit_order(order)
+
+    def process_buy_limit_order(self, order: Order) -> None:
+        """Insert a buy limit order to the book, trading it against the asks
+        from the lowest price up while they are not above its price.
+
+        Args:
+            order (Order): buy limit order being processed
+        """
+        counterparty_level = self.ask.lowest
+        while (
+            (order.qty > 0)
+            and (counterparty_level is not None)
+            and (order.price >= counterparty_level.price)
+        ):
+            # the level may be removed while trading, so move on beforehand #
+            next_level = counterparty_level.higher
+            order = self.trade_limit_order(order, counterparty_level)
+            counterparty_level = next_level
+        if order.qty > 0:
+            self.bid.register_order(order)
+            self.orders_by_id[order.id] = order
+
+    def process_sell_limit_order(self, order: Order) -> None:
+        """Insert a sell limit order to the book, trading it against the bids
+        from the highest price down while they are not below its price.
+
+        Args:
+            order (Order): sell limit order being processed
+        """
+        counterparty_level = self.bid.highest
+        while (
+            (order.qty > 0)
+            and (counterparty_level is not None)
+            and (order.price <= counterparty_level.price)
+        ):
+            # the level may be removed while trading, so move on beforehand #
+            next_level = counterparty_level.lower
             order = self.trade_limit_order(order, counterparty_level)
-            counterparty_level = counterparty_side.next_level(counterparty_level)
+            counterparty_level = next_level
+        if order.qty > 0:
+            self.ask.register_order(order)
+            self.orders_by_id[order.id] = order
 
     def process_market_order(self, order: Order) -> None:
         """Execute any available trades found.
@@ -104,18 +183,26 @@ def process_market_order(self, order: Order) -> None:
             order (Order): market order being processed
         """
         counterparty_side: BookSide = self.ask if order.is_buy else self.bid
-        if order.is_buy:
-            counterparty_level = self.ask.min_level()
+        best_level = self.ask.min_level if order.is_buy else self.bid.max_level
+        worse_level = self.ask.next_level if order.is_buy else self.bid.prev_level
+        counterparty_level = best_level()
+        if counterparty_level is None:
+            self.reports.append("Booking failed: no orders to match\n")
+        elif order.qty >= counterparty_side.total_qty:
+            # the order sweeps the whole side, which is then dropped at once #
+            orders_by_id = self.orders_by_id
+            while counterparty_level is not None:
+                self.print_match(counterparty_level.price, counterparty_level.total_qty)
+                for order_id in counterparty_level.orders:
+                    del orders_by_id[order_id]
+                counterparty_level = worse_level(counterparty_level)
+            order.qty -= counterparty_side.total_qty
+            counterparty_side.clear()
         else:
-            counterparty_level = self.bid.max_level()
-        if counterparty_level is not None:
+            # a level is only left behind once it is exhausted and removed #
             while order.qty > 0:
                 order = self.trade_at_level(order, counterparty_level)
-                counterparty_level = counterparty_side.next_level(counterparty_level)
-                if counterparty_level is None:
-                    break
-        else:
-            print("Booking failed: no orders to match")
+                counterparty_level = best_level()
 
     def trade_limit_order(self, limit_order: Order, level: Level) -> Order:
         """Execute a trade and update orders if a proper counterparty is found.
@@ -141,31 +228,36 @@ def trade_limit_order(self, limit_order: Order, level: Level) -> Order:
         """
         if limit_order.price == level.price:
             return self.trade_at_level(limit_order, level)
+        # the level shares one price and the limit order is fixed meanwhile #
+        price = level.price
+        limit_qty = limit_order.qty
+        limit_total = limit_qty * limit_order.price
         counterparty: Order = level.head
-        while (counterparty.total() == limit_order.total()) or (
-            counterparty.qty == limit_order.qty
+        while (counterparty is not None) and (
+            (counterparty.qty == limit_qty) or (counterparty.qty * price == limit_total)
         ):
             counterparty = counterparty.next
-            if counterparty is None:
-                return limit_order
-
-        new_qty = abs(counterparty.qty - limit_order.qty)
-        new_total = abs(counterparty.total() - limit_order.total())
-        if counterparty.total() > limit_order.total():
-            counterparty.price = new_total / new_qty
-            counterparty.qty = counterparty.qty - limit_order.qty
+        if counterparty is None:
+            return limit_order
+
+        counterparty_side = self.bid if level.is_bid else self.ask
+        counterparty_total = counterparty.qty * price
+        new_qty = abs(counterparty.qty - limit_qty)
+        new_total = abs(counterparty_total - limit_total)
+        if counterparty_total > limit_total:
+            counterparty.price = (2 * new_total + new_qty) // (2 * new_qty)
+            counterparty.qty -= limit_qty
+            level.total_qty -= limit_qty
+            counterparty_side.total_qty -= limit_qty
             self.reallocate_order(counterparty, level)
-            self.print_match(limit_order.price, limit_order.qty)
+            self.print_match(limit_order.price, limit_qty)
             limit_order.qty = 0
         else:
-            limit_order.price = new_total / new_qty
+            limit_order.price = (2 * new_total + new_qty) // (2 * new_qty)
             limit_order.qty = new_qty
             self.print_match(counterparty.price, counterparty.qty)
-            counterparty_side = self.bid if counterparty.is_buy else self.ask
-            counterparty_side.total_qty -= limit_order.qty
-            level.remove_order(counterparty)
-            if level.head is None:
-                counterparty_side.remove_level(level)
+            counterparty_side.remove_order(counterparty, level)
+            del self.orders_by_id[counterparty.id]
         return limit_order
 
     def trade_at_level(self, market_order: Order, level: Level) -> Order:
@@ -179,38 +271,51 @@ def trade_at_level(self, market_order: Order, level: Level) -> Order:
         Returns:
             Order: `market_order` after trading at this level
         """
-        qty_traded = 0
-        counterparty: Order = level.head
-        while (counterparty is not None) and (market_order.qty > 0):
-            if counterparty.qty <= market_order.qty:
-                level.dequeue_order()
-                qty_traded += counterparty.qty
-                market_order.qty -= counterparty.qty
-            else:
-                counterparty.qty -= market_order.qty
-                level.total_qty -= market_order.qty
-                qty_traded += market_order.qty
-                market_order.qty = 0
-            counterparty = counterparty.next
-        if level.is_bid:
-            self.bid.total_qty -= qty_traded
-            if level.total_qty == 0:
-                self.bid.remove_level(level)
+        orders_by_id = self.orders_by_id
+        if market_order.qty >= level.total_qty:
+            # the whole queue is filled, so its orders need not be visited #
+            qty_traded = level.total_qty
+            for order_id in level.orders:
+                del orders_by_id[order_id]
+            level.total_qty = 0
+            level.head = level.tail = None
+            market_order.qty -= qty_traded
         else:
-            self.ask.total_qty -= qty_traded
-            if level.total_qty == 0:
-                self.ask.remove_level(level)
+            # the order ends inside the queue, so the head never runs off it #
+            qty_traded = remaining = market_order.qty
+            level_orders = level.orders
+            head: Order = level.head
+            while head.qty <= remaining:
+                remaining -= head.qty
+                del orders_by_id[head.id]
+                del level_orders[head.id]
+                head = head.next
+            head.qty -= remaining
+            head.prev = None
+            level.head = head
+            level.total_qty -= qty_traded
+            market_order.qty = 0
+        side = self.bid if level.is_bid else self.ask
+        side.total_qty -= qty_traded
+        if level.head is None:
+            side.remove_level(level)
         self.print_match(level.price, qty_traded)
         return market_order
 
-    def print_match(self, price: float, qty: int) -> None:
-        """Display the results of a successful match.
+    def print_match(self, price: int, qty: int) -> None:
+        """Queue the results of a successful match to be displayed.
 
         Args:
-            price (float): price at which the trade was executed
+            price (int): price at which the trade was executed, in ticks
             qty (int): amount of shares traded
         """
-        print(f"Trade, price: {price}, qty: {qty}")
+        self.reports.append(f"Trade, price: {price / TICKS_PER_UNIT}, qty: {qty}\n")
+
+    def flush_reports(self) -> None:
+        """Display every queued output line with a single write."""
+        if self.reports:
+            sys.stdout.write("".join(self.reports))
+            self.reports.clear()
 
     def reallocate_order(self, order: Order, origin_level: Level) -> None:
         """Reinsert a modified order in the book.
@@ -218,9 +323,21 @@ def reallocate_order(self, order: Order, origin_level: Level) -> None:
         Args:
             order (Order): limit order modified through trading
             origin_level (Level): original price level of the order
+
+        The order goes to the front of the queue of its new price level.
+        If its price did not change, it just keeps its place in queue;
+        and if the new price already has a level, the order is moved
+        straight to it, without searching the tree.
         """
+        if order.price == origin_level.price:
+            return
+        side = self.bid if order.is_buy else self.ask
+        target = side.find_level(order.price)
+        if target is None:
+            side.remove_order(order, origin_level)
+            side.register_order(order, front=True)
+            return
         origin_level.remove_order(order)
-        if order.is_buy:
-            self.bid.register_order(order, True)
-        else:
-            self.ask.register_order(order, True)
+        target.push_front(order)
+        if origin_level.head is None:
+            side.remove_level(origin_level)
@@ -1,15 +1,18 @@
 """Implements a price level class that is a (linked list) queue capsule and a
-BST node."""
+red-black tree node."""
 
 from .quote import Order
 
+RED = True
+BLACK = False
+
 
 class Level:
     """Class to represent a price level in the OrderBook.
 
     Attributes
     ----------
-    price : float
+    price : int
         Price of all the limit orders stored in queue
     is_bid : bool
         Indicates if the level contains buy (`True`) or sell (`False`) orders
@@ -19,12 +22,20 @@ class Level:
         Points to the first order in queue
     tail : Order
         Points to the last order in queue
+    orders : dict[int, Order]
+        Indexes the orders in queue by their `id`
     right : Level
         Points to a right-son level in the BST (BookSide)
     left : Level
         Points to a left-son level in the BST (BookSide)
     parent : Level
         Points to its parent level in the BST (BookSide)
+    color : bool
+        Color of the node in the red-black tree: `RED` or `BLACK`
+    lower : Level
+        Points to the level with the next lower price in the BookSide
+    higher : Level
+        Points to the level with the next higher price in the BookSide
 
     Methods
     -------
@@ -34,15 +45,29 @@ class Level:
     dequeue_order() -> Order:
         removes and returns the limit order in the front of the queue
 
-    insert_order(limit_order: Order) -> None:
-        inserts a limit order considering its timestamp
-        relative to the ones already in queue
+    push_front(limit_order: Order) -> None:
+        adds a limit order in the front of the queue
 
     remove_order(limit_order: Order) -> None:
         removes a specific limit order inside the queue
-        identifying it by its timestamp
+        by unlinking it from its neighbours
     """
 
+    __slots__ = (
+        "price",
+        "is_bid",
+        "total_qty",
+        "head",
+        "tail",
+        "orders",
+        "right",
+        "left",
+        "parent",
+        "color",
+        "lower",
+        "higher",
+    )
+
     def __init__(self, limit_order: Order) -> None:
         """Build a new price level based on a limit order.
 
@@ -50,16 +75,21 @@ def __init__(self, limit_order: Order) -> None:
             limit_order (Order)
         """
         # Level data #
-        self.price: float = limit_order.price
+        self.price: int = limit_order.price
         self.is_bid: bool = limit_order.is_buy
         self.total_qty: int = limit_order.qty
         # References to the first and last nodes in the Queue #
         self.head: Order = limit_order
         self.tail: Order = limit_order
+        self.orders: dict[int, Order] = {limit_order.id: limit_order}
         # Binary Search Tree node fields #
         self.right: Level = None
         self.left: Level = None
         self.parent: Level = None
+        self.color: bool = RED
+        # Price-ordered links between the levels of the BookSide #
+        self.lower: Level = None
+        self.higher: Level = None
 
     def enqueue_order(self, limit_order: Order) -> None:
         """Add a new limit order in the end of the queue.
@@ -68,6 +98,7 @@ def enqueue_order(self, limit_order: Order) -> None:
             limit_order (Order): limit order to be added
         """
         self.total_qty += limit_order.qty
+        self.orders[limit_order.id] = limit_order
         if self.head is None:
             self.head = limit_order
         else:
@@ -87,47 +118,43 @@ def dequeue_order(self) -> Order:
             if self.head is not None:
                 self.head.prev = None
         self.total_qty -= order.qty
+        del self.orders[order.id]
         if order == self.tail:
             self.tail = None
         return order
 
-    def insert_order(self, limit_order: Order) -> None:
-        """Insert a limit order considering its timestamp relative to the ones
-        already in queue.
+    def push_front(self, limit_order: Order) -> None:
+        """Add a limit order in the front of the queue.
 
         Args:
             limit_order (Order): limit order to be added
         """
-        if limit_order.timestamp >= self.tail.timestamp:
-            self.enqueue_order(limit_order)
-            return
         self.total_qty += limit_order.qty
-        pointer: Order = self.head
-        aux: Order = None
-        while pointer.timestamp >= limit_order.timestamp:
-            aux = pointer
-            pointer = pointer.next
-        aux.next = limit_order
-        pointer.prev = limit_order
-        limit_order.next = pointer
-        limit_order.prev = aux
+        self.orders[limit_order.id] = limit_order
+        limit_order.prev = None
+        limit_order.next = self.head
+        if self.head is None:
+            self.tail = limit_order
+        else:
+            self.head.prev = limit_order
+        self.head = limit_order
 
     def remove_order(self, limit_order: Order) -> None:
-        """Remove a specific limit order inside the queue identifying it by its
-        timestamp.
+        """Remove a specific limit order inside the queue by unlinking it from
+        its neighbours, without scanning the queue.
 
         Args:
             limit_order (Order): limit order to be removed
         """
-        if limit_order == self.head:
-            self.dequeue_order()
-            return
+        prev_order, next_order = limit_order.prev, limit_order.next
+        if prev_order is None:
+            self.head = next_order
+        else:
+            prev_order.next = next_order
+        if next_order is None:
+            self.tail = prev_order
+        else:
+            next_order.prev = prev_order
+        limit_order.prev = limit_order.next = None
         self.total_qty -= limit_order.qty
-        pointer: Order = self.head
-        aux: Order = None
-        while pointer != limit_order:
-            aux = pointer
-            pointer = pointer.next
-        aux.next = limit_order.next
-        if limit_order.next is not None:
-            limit_order.next.prev = aux
+        del self.orders[limit_order.id]
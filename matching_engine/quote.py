@@ -1,7 +1,17 @@
 """Implements a helper quote class to send orders as doubly-linked list nodes
 to the exchange."""
 
-from datetime import datetime
+from itertools import count
+
+_counter = count()
+
+# Prices are stored as integer ticks, a tick being 1 / TICKS_PER_UNIT #
+TICKS_PER_UNIT = 10000
+
+# Setting the ASCII case bit folds an upper case letter into its lower case #
+_CASE_BIT = 0x20
+_LIMIT_TAG = ord("l")
+_BUY_TAG = ord("b")
 
 
 class Quote:
@@ -13,28 +23,36 @@ class Quote:
         Indicates the type of the order: limit (`True`) or market (`False`)
     is_buy : bool
         Indicates if the order is buy (`True`) or sell (`False`)
-    price : float
-        If the order is of type limit, it stores the price set,
-        otherwise, `None`
+    price : int
+        If the order is of type limit, it stores the price set
+        in ticks (see `TICKS_PER_UNIT`), otherwise, `None`
     qty : int
         Ammunt of shares to be traded
-    timestamp : datetime
-        Timestamp of the instant the order was given,
-        so that it can be uniquely identified
+    id : int
+        Sequential number that identifies the order in the book,
+        which also follows the order in which the quotes arrived
     """
 
-    def __init__(self, quote: str) -> None:
+    __slots__ = ("is_limit", "is_buy", "price", "qty", "id")
+
+    def __init__(self, quote: bytes) -> None:
         """Build a quote from a expected string sintax.
 
         Args:
-            quote (str)
+            quote (bytes): raw quote as read from the input
+            (a `str` is also accepted)
         """
-        quote_items = quote.lower().split()
-        self.is_limit = True if (quote_items[0] == "limit") else False
-        self.is_buy = True if (quote_items[1] == "buy") else False
-        self.price = float(quote_items[2]) if self.is_limit else None
+        if isinstance(quote, str):
+            quote = quote.encode()
+        quote_items = quote.split()
+        self.is_limit = (quote_items[0][0] | _CASE_BIT) == _LIMIT_TAG
+        self.is_buy = (quote_items[1][0] | _CASE_BIT) == _BUY_TAG
+        if self.is_limit:
+            self.price = round(float(quote_items[2]) * TICKS_PER_UNIT)
+        else:
+            self.price = None
         self.qty = int(quote_items[-1])
-        self.timestamp = datetime.now()
+        self.id = next(_counter)
 
 
 class Order(Quote):
@@ -53,37 +71,39 @@ class Order(Quote):
         Indicates the type of the order: limit (`True`) or market (`False`)
     is_buy : bool
         Indicates if the order is buy (`True`) or sell (`False`)
-    price : float
-        If the order is of type limit, it stores the price set,
-        otherwise, `None`
+    price : int
+        If the order is of type limit, it stores the price set
+        in ticks (see `TICKS_PER_UNIT`), otherwise, `None`
     qty : int
         Ammunt of shares to be traded
-    timestamp : datetime
-        Timestamp of the instant the order was given,
-        so that it can be uniquely identified
+    id : int
+        Sequential number that identifies the order in the book,
+        which also follows the order in which the quotes arrived
 
     Methods
     -------
-    total -> float:
+    total -> int:
         Returns the total volume (`.qty * .price`) of the order -
         if it is of limit type, otherwise, `None`
     """
 
-    def __init__(self, quote: str) -> None:
+    __slots__ = ("next", "prev")
+
+    def __init__(self, quote: bytes) -> None:
         """Build a new order based on a given quote.
 
         Args:
-            quote (str): string describing the order
+            quote (bytes): string describing the order
         """
         super().__init__(quote)
         self.next: Order = None
         self.prev: Order = None
 
-    def total(self) -> float:
+    def total(self) -> int:
         """Return the volume of the order.
 
         Returns:
-            float: qty * price
+            int: qty * price, in ticks
             None: if it is a market order
         """
         if self.is_limit:
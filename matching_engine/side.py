@@ -1,7 +1,12 @@
-"""Implements one side of an order book as a binary search tree."""
+"""Implements one side of an order book as a red-black tree."""
 
 from .quote import Order
-from .level import Level
+from .level import Level, RED, BLACK
+
+
+def _is_red(level: Level) -> bool:
+    """Tell whether a node is red, treating missing leaves as black."""
+    return (level is not None) and (level.color == RED)
 
 
 class BookSide:
@@ -10,17 +15,33 @@ class BookSide:
     Attributes
     ----------
     root : Level
-        Points to the first level stored in the binary search tree
+        Points to the first level stored in the red-black tree
     is_bid : bool
         Indicates if the side contains bid (`True`) or ask (`False`) prices
     total_qty : int
         Total amount of shares to be traded in this side of the book
+    lowest : Level
+        Points to the level with the lowest price (cached leftmost node)
+    highest : Level
+        Points to the level with the highest price (cached rightmost node)
+    levels : dict[int, Level]
+        Indexes every level of the side by its price
 
     Methods
     -------
-    register_order(limit_order: Order, timestamp: bool = False) -> None:
+    register_order(limit_order: Order, front: bool = False) -> None:
         Properly registers a limit order in the order book.
 
+    remove_order(limit_order: Order, level: Level) -> None:
+        Removes a booked limit order from its level,
+        dropping the level once it is empty.
+
+    clear() -> None:
+        Removes every level of the side at once.
+
+    find_level(price: int) -> Level:
+        Finds the level with a given price, if there is one.
+
     min_level(start: Level = None) -> Level:
         Finds the level with the lowest price.
 
@@ -30,6 +51,9 @@ class BookSide:
     next_level(level: Level) -> Level:
         Finds the successor of a given price level.
 
+    prev_level(level: Level) -> Level:
+        Finds the predecessor of a given price level.
+
     replace_level(old: Level, new: Level) -> None:
         Replaces a given level by another one inside the BST.
 
@@ -47,22 +71,37 @@ def __init__(self, is_bid: bool) -> None:
         self.root: Level = None
         self.is_bid: bool = is_bid
         self.total_qty: int = 0
+        # Ends of the price-ordered list of levels #
+        self.lowest: Level = None
+        self.highest: Level = None
+        # Hash index of the tree, so that a known price skips the search #
+        self.levels: dict[int, Level] = {}
 
-    def register_order(self, limit_order: Order, timestamp: bool = False):
+    def register_order(self, limit_order: Order, front: bool = False):
         """Properly register a limit order in the order book.
 
         If there's no existing Level for the order, one is created.
-        If `timestamp` is not given, the order is enqueued in its Level,
-        otherwise, the order will be inserted respecting its timestamp.
+        If `front` is not given, the order is enqueued in its Level,
+        otherwise, the order will be put in the front of the queue.
 
         Args:
             limit_order (Order): limit order to be registered
-            timestamp (bool, optional): indicates whether the order should be
-            added at the end or in the middle of a queue. Defaults to False.
+            front (bool, optional): indicates whether the order should be
+            added at the end or at the front of a queue. Defaults to False.
         """
         self.total_qty += limit_order.qty
+        level = self.levels.get(limit_order.price)
+        if level is not None:
+            if front:
+                level.push_front(limit_order)
+            else:
+                level.enqueue_order(limit_order)
+            return
         if self.root is None:
             self.root = Level(limit_order)
+            self.root.color = BLACK
+            self.lowest = self.highest = self.root
+            self.levels[limit_order.price] = self.root
             return
         pointer: Level = self.root
         aux: Level = None
@@ -70,37 +109,72 @@ def register_order(self, limit_order: Order, timestamp: bool = False):
             aux = pointer
             if pointer.price > limit_order.price:
                 pointer = pointer.left
-            elif pointer.price < limit_order.price:
-                pointer = pointer.right
-            else:
-                break
-        if aux.price == limit_order.price:
-            if timestamp:
-                aux.insert_order(limit_order)
             else:
-                aux.enqueue_order(limit_order)
-            return
-        elif aux.price > limit_order.price:
+                pointer = pointer.right
+        if aux.price > limit_order.price:
             aux.left = Level(limit_order)
             level = aux.left
+            level.lower, level.higher = aux.lower, aux
         else:
             aux.right = Level(limit_order)
             level = aux.right
+            level.lower, level.higher = aux, aux.higher
         level.parent = aux
+        self.levels[level.price] = level
+        if level.lower is None:
+            self.lowest = level
+        else:
+            level.lower.higher = level
+        if level.higher is None:
+            self.highest = level
+        else:
+            level.higher.lower = level
+        self._fix_insert(level)
+
+    def remove_order(self, limit_order: Order, level: Level) -> None:
+        """Remove a booked limit order from its level, dropping the level once
+        it is empty.
+
+        Args:
+            limit_order (Order): limit order to be removed
+            level (Level): price level where the order is queued
+        """
+        level.remove_order(limit_order)
+        self.total_qty -= limit_order.qty
+        if level.head is None:
+            self.remove_level(level)
+
+    def clear(self) -> None:
+        """Remove every level of the side at once."""
+        self.root = self.lowest = self.highest = None
+        self.levels = {}
+        self.total_qty = 0
+
+    def find_level(self, price: int) -> Level:
+        """Find the level with a given price, if there is one.
+
+        Args:
+            price (int): price of the level wanted, in ticks
+
+        Returns:
+            Level: the price level wanted, or `None` if there isn't one
+        """
+        return self.levels.get(price)
 
     def min_level(self, start: Level = None) -> Level:
         """Find the level with the lowest price.
 
         Args:
             start (Level, optional): specifies the starting level
-            of the search. Defaults to None.
+            of the search. Defaults to None, in which case the cached
+            lowest level is returned.
 
         Returns:
             Level: the price level wanted
         """
-        level = start if (start is not None) else self.root
-        if level is None:
-            return None
+        if start is None:
+            return self.lowest
+        level = start
         while level.left is not None:
             level = level.left
         return level
@@ -110,14 +184,15 @@ def max_level(self, start: Level = None) -> Level:
 
         Args:
             start (Level, optional): specifies the starting level
-            of the search. Defaults to None.
+            of the search. Defaults to None, in which case the cached
+            highest level is returned.
 
         Returns:
             Level: the price level wanted
         """
-        level = start if (start is not None) else self.root
-        if level is None:
-            return None
+        if start is None:
+            return self.highest
+        level = start
         while level.right is not None:
             level = level.right
         return level
@@ -136,14 +211,23 @@ def next_level(self, level: Level) -> Level:
         """
         if level is None:
             return None
-        if level.right is not None:
-            return self.min_level(level.right)
-        next_level = level.parent
-        aux = level
-        while (next_level is not None) and (aux == next_level.right):
-            aux = next_level
-            next_level = next_level.parent
-        return next_level
+        return level.higher
+
+    def prev_level(self, level: Level) -> Level:
+        """Find the predecessor of a given price level.
+
+        "Predecessor" being the price level with the highest price
+        thats is lower than `level.price`
+
+        Args:
+            level (Level): price level whose predecessor is wanted
+
+        Returns:
+            Level: the predecessor
+        """
+        if level is None:
+            return None
+        return level.lower
 
     def replace_level(self, old: Level, new: Level) -> None:
         """Replace a given level by another one inside the BST.
@@ -170,16 +254,153 @@ def remove_level(self, level: Level) -> None:
         Args:
             level (Level): price level to be removed
         """
+        del self.levels[level.price]
+        if level.lower is None:
+            self.lowest = level.higher
+        else:
+            level.lower.higher = level.higher
+        if level.higher is None:
+            self.highest = level.lower
+        else:
+            level.higher.lower = level.lower
+        removed_color = level.color
         if level.left is None:
+            child, parent = level.right, level.parent
             self.replace_level(level, level.right)
         elif level.right is None:
+            child, parent = level.left, level.parent
             self.replace_level(level, level.left)
         else:
-            next_level = self.next_level(level)
+            next_level = level.higher
+            removed_color = next_level.color
+            child = next_level.right
             if next_level.parent != level:
+                parent = next_level.parent
                 self.replace_level(next_level, next_level.right)
                 next_level.right = level.right
                 next_level.right.parent = next_level
+            else:
+                parent = next_level
             self.replace_level(level, next_level)
             next_level.left = level.left
             next_level.left.parent = next_level
+            next_level.color = level.color
+        level.parent = level.left = level.right = None
+        level.lower = level.higher = None
+        if removed_color == BLACK:
+            self._fix_delete(child, parent)
+
+    def _rotate_left(self, level: Level) -> None:
+        """Rotate the subtree rooted at `level` to the left.
+
+        Args:
+            level (Level): root of the subtree, must have a right son
+        """
+        pivot = level.right
+        level.right = pivot.left
+        if pivot.left is not None:
+            pivot.left.parent = level
+        self.replace_level(level, pivot)
+        pivot.left = level
+        level.parent = pivot
+
+    def _rotate_right(self, level: Level) -> None:
+        """Rotate the subtree rooted at `level` to the right.
+
+        Args:
+            level (Level): root of the subtree, must have a left son
+        """
+        pivot = level.left
+        level.left = pivot.right
+        if pivot.right is not None:
+            pivot.right.parent = level
+        self.replace_level(level, pivot)
+        pivot.right = level
+        level.parent = pivot
+
+    def _fix_insert(self, level: Level) -> None:
+        """Restore the red-black properties after inserting a red level.
+
+        Args:
+            level (Level): newly inserted level
+        """
+        while _is_red(level.parent):
+            parent = level.parent
+            grandparent = parent.parent
+            if parent == grandparent.left:
+                uncle = grandparent.right
+                if _is_red(uncle):
+                    parent.color = uncle.color = BLACK
+                    grandparent.color = RED
+                    level = grandparent
+                    continue
+                if level == parent.right:
+                    self._rotate_left(parent)
+                    level, parent = parent, level
+                parent.color = BLACK
+                grandparent.color = RED
+                self._rotate_right(grandparent)
+            else:
+                uncle = grandparent.left
+                if _is_red(uncle):
+                    parent.color = uncle.color = BLACK
+                    grandparent.color = RED
+                    level = grandparent
+                    continue
+                if level == parent.left:
+                    self._rotate_right(parent)
+                    level, parent = parent, level
+                parent.color = BLACK
+                grandparent.color = RED
+                self._rotate_left(grandparent)
+        self.root.color = BLACK
+
+    def _fix_delete(self, level: Level, parent: Level) -> None:
+        """Restore the red-black properties after removing a black level.
+
+        Args:
+            level (Level): node that took the removed one's place (may be None)
+            parent (Level): parent of `level`, since it may be a missing leaf
+        """
+        while (level != self.root) and not _is_red(level):
+            if level == parent.left:
+                sibling = parent.right
+                if _is_red(sibling):
+                    sibling.color = BLACK
+                    parent.color = RED
+                    self._rotate_left(parent)
+                    sibling = parent.right
+                if not _is_red(sibling.left) and not _is_red(sibling.right):
+                    sibling.color = RED
+                    level, parent = parent, parent.parent
+                    continue
+                if not _is_red(sibling.right):
+                    sibling.left.color = BLACK
+                    sibling.color = RED
+                    self._rotate_right(sibling)
+                    sibling = parent.right
+                sibling.color = parent.color
+                parent.color = sibling.right.color = BLACK
+                self._rotate_left(parent)
+            else:
+                sibling = parent.left
+                if _is_red(sibling):
+                    sibling.color = BLACK
+                    parent.color = RED
+                    self._rotate_right(parent)
+                    sibling = parent.left
+                if not _is_red(sibling.left) and not _is_red(sibling.right):
+                    sibling.color = RED
+                    level, parent = parent, parent.parent
+                    continue
+                if not _is_red(sibling.left):
+                    sibling.right.color = BLACK
+                    sibling.color = RED
+                    self._rotate_left(sibling)
+                    sibling = parent.left
+                sibling.color = parent.color
+                parent.color = sibling.left.color = BLACK
+                self._rotate_right(parent)
+            level = self.root
+        if level is not None:
+            level.color = BLACK